@@ -11,10 +11,20 @@ Aggregates per park:
 
 from __future__ import annotations
 
-import csv
 import json
-from collections import defaultdict
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    from process import ReviewColumns
 
 
 def _ensure_ext(filename: str, ext: str) -> str:
@@ -26,13 +36,6 @@ def _ensure_ext(filename: str, ext: str) -> str:
     return filename
 
 
-def _safe_int(value, default: int = 0) -> int:
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return default
-
-
 @dataclass(frozen=True)
 class ParkSummary:
     park: str
@@ -42,46 +45,59 @@ class ParkSummary:
     unique_countries: int
 
 
+_FIELDS = [
+    "ParkName",
+    "NumberOfReviews",
+    "NumberOfPositiveReviews",
+    "AverageReviewScore",
+    "NumberOfUniqueCountries",
+]
+
+
 class ParkAnalyzer:
-    def __init__(self, rows: list[dict]):
-        self._rows = rows or []
-        self._summaries: list[ParkSummary] = self._build_summaries()
-
-    def _build_summaries(self) -> list[ParkSummary]:
-        totals = defaultdict(int)
-        positive = defaultdict(int)
-        rating_sum = defaultdict(int)
-        countries = defaultdict(set)
-
-        for r in self._rows:
-            park = (r.get("Branch") or "").strip()
-            if not park:
-                continue
-
-            rating = _safe_int(r.get("Rating"), default=0)
-            loc = (r.get("Reviewer_Location") or "").strip()
-
-            totals[park] += 1
-            rating_sum[park] += rating
-            if rating >= 4:
-                positive[park] += 1
-            if loc:
-                countries[park].add(loc)
-
-        summaries: list[ParkSummary] = []
-        for park in sorted(totals.keys()):
-            n = totals[park]
-            avg = (rating_sum[park] / n) if n else 0.0
-            summaries.append(
-                ParkSummary(
-                    park=park,
-                    reviews=n,
-                    positive_reviews=positive[park],
-                    average_score=round(avg, 2),
-                    unique_countries=len(countries[park]),
-                )
-            )
-        return summaries
+    def __init__(self, cols: ReviewColumns | None):
+        self._cols = cols
+        self._summary_df = self._build_summary_df() if cols is not None else pd.DataFrame(columns=_FIELDS)
+        self._summaries: list[ParkSummary] = [
+            ParkSummary(*row) for row in self._summary_df.itertuples(index=False, name=None)
+        ]
+
+    def _build_summary_df(self) -> pd.DataFrame:
+        cols = self._cols
+        n_parks = len(cols.branch_cat.categories)
+        n_loc = len(cols.loc_cat.categories)
+        valid = cols.branch_codes >= 0
+        parks = cols.branch_codes[valid]
+        ratings = cols.rating[valid]
+        locs = cols.loc_codes[valid]
+
+        # A single histogram over (park, location + 1, rating) carries every
+        # aggregate; slot 0 on the location axis holds rows with no location.
+        if len(ratings) and ratings.min() < 0:
+            # A negative rating would index into the neighbouring cell.
+            raise ValueError("ratings must be non-negative")
+        n_ratings = int(ratings.max()) + 1 if len(ratings) else 1
+        flat = (parks.astype(np.int64) * (n_loc + 1) + (locs + 1)) * n_ratings + ratings
+        hist = np.bincount(flat, minlength=n_parks * (n_loc + 1) * n_ratings)
+        hist = hist.reshape(n_parks, n_loc + 1, n_ratings)
+
+        by_rating = hist.sum(axis=1)
+        totals = by_rating.sum(axis=1)
+        rating_sum = by_rating @ np.arange(n_ratings)
+        positive = by_rating[:, 4:].sum(axis=1)
+        countries = hist[:, 1:, :].any(axis=2).sum(axis=1)
+
+        present = np.flatnonzero(totals)
+        return pd.DataFrame(
+            {
+                "ParkName": cols.branch_cat.categories[present].astype(object),
+                "NumberOfReviews": totals[present],
+                "NumberOfPositiveReviews": positive[present],
+                "AverageReviewScore": [round(float(t) / n, 2) for t, n in zip(rating_sum[present], totals[present])],
+                "NumberOfUniqueCountries": countries[present],
+            },
+            columns=_FIELDS,
+        )
 
     def get_aggregated_data(self) -> list[dict]:
         return [
@@ -97,23 +113,22 @@ class ParkAnalyzer:
 
     def export_txt(self, filename: str) -> tuple[bool, str]:
         path = _ensure_ext(filename, ".txt")
+        parts = ["Disneyland Park Aggregated Report\n", "=" * 34 + "\n\n"]
+        if not self._summaries:
+            parts.append("No data to report.\n")
+        parts.extend(
+            f"ParkName: {s.park}\n"
+            f"NumberOfReviews: {s.reviews}\n"
+            f"NumberOfPositiveReviews: {s.positive_reviews}\n"
+            f"AverageReviewScore: {s.average_score}\n"
+            f"NumberOfUniqueCountries: {s.unique_countries}\n"
+            + "-" * 30
+            + "\n"
+            for s in self._summaries
+        )
         try:
             with open(path, "w", encoding="utf-8") as f:
-                f.write("Disneyland Park Aggregated Report\n")
-                f.write("=" * 34 + "\n\n")
-
-                if not self._summaries:
-                    f.write("No data to report.\n")
-                    return True, path
-
-                for s in self._summaries:
-                    f.write(f"ParkName: {s.park}\n")
-                    f.write(f"NumberOfReviews: {s.reviews}\n")
-                    f.write(f"NumberOfPositiveReviews: {s.positive_reviews}\n")
-                    f.write(f"AverageReviewScore: {s.average_score}\n")
-                    f.write(f"NumberOfUniqueCountries: {s.unique_countries}\n")
-                    f.write("-" * 30 + "\n")
-
+                f.write("".join(parts))
             return True, path
         except OSError:
             return False, path
@@ -121,28 +136,22 @@ class ParkAnalyzer:
     def export_csv(self, filename: str) -> tuple[bool, str]:
         path = _ensure_ext(filename, ".csv")
         try:
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(
-                    f,
-                    fieldnames=[
-                        "ParkName",
-                        "NumberOfReviews",
-                        "NumberOfPositiveReviews",
-                        "AverageReviewScore",
-                        "NumberOfUniqueCountries",
-                    ],
-                )
-                writer.writeheader()
-                writer.writerows(self.get_aggregated_data())
+            # \r\n matches the csv module's default dialect used previously.
+            self._summary_df.to_csv(path, index=False, lineterminator="\r\n", encoding="utf-8")
             return True, path
         except OSError:
             return False, path
 
     def export_json(self, filename: str) -> tuple[bool, str]:
         path = _ensure_ext(filename, ".json")
+        data = self.get_aggregated_data()
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(self.get_aggregated_data(), f, indent=2)
+            if orjson is not None:
+                with open(path, "wb") as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2)
             return True, path
         except OSError:
             return False, path
@@ -5,101 +5,272 @@ Data loading and analysis functions for the Disneyland Review Analyser.
 
 from __future__ import annotations
 
-import csv
-from collections import defaultdict
-from typing import Callable
+import io
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    _CSV_ENGINE = "c"
+else:
+    # Multi-threaded block parser; used whenever pyarrow is installed.
+    _CSV_ENGINE = "pyarrow"
+
+_COLUMNS = ["Branch", "Rating", "Reviewer_Location", "Year_Month"]
+_CSV_OPTIONS = {"usecols": _COLUMNS, "dtype": str, "keep_default_na": False, "encoding": "utf-8"}
+# Below this size a process pool costs more to start than it saves.
+_PARALLEL_MIN_BYTES = 100 * 1024 * 1024
+_EMPTY = np.empty(0, dtype=np.intp)
 
 
 def _norm(text: str) -> str:
     return (text or "").strip().lower()
 
 
-def read_reviews_csv(file_path: str) -> list[dict]:
-    """Read CSV into list of dicts; convert Rating to int (invalid -> 0)."""
-    rows: list[dict] = []
-    with open(file_path, mode="r", encoding="utf-8", newline="") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            rating_raw = (row.get("Rating") or "").strip()
-            row["Rating"] = int(rating_raw) if rating_raw.isdigit() else 0
-            rows.append(row)
-    return rows
+def _parse_year_month(text: str) -> tuple[int, int]:
+    """(year, zero-based month) from "YYYY-M"; -1 for a part that does not parse."""
+    text = text.strip()
+    head = text[:4]
+    year = int(head) if len(head) == 4 and head.isascii() and head.isdigit() else -1
 
+    month = -1
+    parts = text.split("-")
+    if len(parts) == 2:
+        try:
+            month = int(parts[1]) - 1
+        except ValueError:
+            pass
+    return year, month if 0 <= month <= 11 else -1
+
+
+def _decode_year_month(col: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Per-row year and month, parsed once per distinct Year_Month value."""
+    raw = col.cat
+    parsed = [_parse_year_month(text) for text in raw.categories]
+    # Trailing -1 so that missing raw values (code -1) stay unknown.
+    years = np.array([y for y, _ in parsed] + [-1], dtype=np.int16)
+    months = np.array([m for _, m in parsed] + [-1], dtype=np.int8)
+    codes = raw.codes.to_numpy()
+    return years[codes], months[codes]
+
+
+def _encode(col: pd.Series) -> tuple[np.ndarray, pd.CategoricalDtype]:
+    """Stripped values as int32 codes (-1 for blank) plus their sorted categories.
+
+    Stripping runs once per distinct raw value; rows are then remapped with
+    a single take over the raw category codes.
+    """
+    raw = col.astype("category").cat
+    stripped = raw.categories.str.strip()
+    remap, uniques = pd.factorize(stripped.where(stripped != ""), sort=True)
+    # Trailing -1 so that missing raw values (code -1) stay blank.
+    remap = np.append(remap, -1).astype(np.int32)
+    return remap[raw.codes.to_numpy()], pd.CategoricalDtype(uniques)
+
+
+@dataclass
+class ReviewColumns:
+    """Reviews stored column-wise as parallel arrays.
+
+    Text fields are held as integer codes into branch_cat/loc_cat and are
+    only decoded back to strings when building output. frame keeps the
+    loaded rows for display.
+    """
+
+    frame: pd.DataFrame
+    branch_codes: np.ndarray
+    rating: np.ndarray
+    loc_codes: np.ndarray
+    year: np.ndarray
+    month: np.ndarray
+    branch_cat: pd.CategoricalDtype
+    loc_cat: pd.CategoricalDtype
+
+    def __len__(self) -> int:
+        return len(self.rating)
+
+    @cached_property
+    def _rows_by_branch(self) -> list[np.ndarray]:
+        order = np.argsort(self.branch_codes, kind="stable")
+        bounds = np.searchsorted(self.branch_codes[order], np.arange(len(self.branch_cat.categories) + 1))
+        return [order[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    @cached_property
+    def _pair_stats(self) -> tuple[np.ndarray, np.ndarray]:
+        """Rating totals and review counts as n_parks x n_locations matrices."""
+        valid = (self.branch_codes >= 0) & (self.loc_codes >= 0)
+        n_parks = len(self.branch_cat.categories)
+        n_loc = len(self.loc_cat.categories)
+        flat = self.branch_codes[valid].astype(np.int64) * n_loc + self.loc_codes[valid]
+        totals = np.bincount(flat, weights=self.rating[valid], minlength=n_parks * n_loc)
+        counts = np.bincount(flat, minlength=n_parks * n_loc)
+        return totals.reshape(n_parks, n_loc), counts.reshape(n_parks, n_loc)
+
+    @cached_property
+    def _branch_keys(self) -> np.ndarray:
+        """Lower-cased park names, indexed by code, for case-insensitive lookups."""
+        return np.asarray(self.branch_cat.categories.str.lower(), dtype=object)
+
+    @cached_property
+    def _loc_keys(self) -> np.ndarray:
+        return np.asarray(self.loc_cat.categories.str.lower(), dtype=object)
+
+    def park_rows(self, park: str) -> np.ndarray:
+        """Row positions (ascending) of every review whose park matches case-insensitively."""
+        codes = _matching_codes(self._branch_keys, park)
+        if len(codes) == 0:
+            return _EMPTY
+        if len(codes) == 1:
+            return self._rows_by_branch[codes[0]]
+        return np.sort(np.concatenate([self._rows_by_branch[c] for c in codes]))
+
+
+def _matching_codes(keys: np.ndarray, text: str) -> np.ndarray:
+    return np.flatnonzero(keys == _norm(text))
+
+
+def _line_ranges(file_path: str, parts: int) -> list[tuple[int, int]] | None:
+    """Split the rows after the header into byte ranges that end on newlines.
+
+    Returns None when the file contains quotes, since a quoted field may
+    hold a newline that is not a row boundary.
+    """
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if data.find(b'"') != -1:
+            return None
+        size = len(data)
+        bounds = [data.find(b"\n") + 1 or size]
+        for k in range(1, parts):
+            start = max(size * k // parts, bounds[-1])
+            bounds.append(data.find(b"\n", start) + 1 or size)
+        bounds.append(size)
+    return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+def _read_range(file_path: str, names: list[str], start: int, stop: int) -> pd.DataFrame:
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(stop - start)
+    return pd.read_csv(io.BytesIO(chunk), header=None, names=names, **_CSV_OPTIONS)
+
+
+def _read_frame_parallel(file_path: str) -> pd.DataFrame | None:
+    """Parse byte ranges of a large file in worker processes (C engine only)."""
+    workers = os.cpu_count() or 1
+    ranges = _line_ranges(file_path, workers) if workers > 1 else None
+    if not ranges:
+        return None
+    names = pd.read_csv(file_path, nrows=0, encoding="utf-8").columns.tolist()
+    starts, stops = zip(*ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(_read_range, repeat(file_path), repeat(names), starts, stops))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _read_frame(file_path: str) -> pd.DataFrame:
+    if _CSV_ENGINE == "pyarrow":
+        # pandas' engine="pyarrow" infers numeric types before applying
+        # dtype=str (255 -> "255.0"), so columns are typed as text here.
+        options = pa_csv.ConvertOptions(
+            include_columns=_COLUMNS,
+            column_types={name: pa.string() for name in _COLUMNS},
+        )
+        try:
+            return pa_csv.read_csv(file_path, convert_options=options).to_pandas()
+        except (pa.ArrowInvalid, pa.ArrowKeyError):
+            # Ragged rows or missing columns; the C parser pads short rows
+            # with blanks and reports missing columns as before.
+            pass
+    elif os.path.getsize(file_path) >= _PARALLEL_MIN_BYTES:
+        df = _read_frame_parallel(file_path)
+        if df is not None:
+            return df
+    return pd.read_csv(file_path, **_CSV_OPTIONS)
+
+
+def read_reviews_csv(file_path: str) -> ReviewColumns:
+    """Read CSV into ReviewColumns; convert Rating to int (invalid or > 127 -> 0)."""
+    df = _read_frame(file_path).fillna("")
+
+    rating_raw = df["Rating"].str.strip()
+    rating = pd.to_numeric(rating_raw.where(rating_raw.str.isdigit()), errors="coerce")
+    # Anything int8 cannot hold counts as invalid rather than wrapping round.
+    df["Rating"] = rating.where(rating.between(0, 127), 0).astype("int8")
+    df["Branch"] = df["Branch"].astype("category")
+    df["Reviewer_Location"] = df["Reviewer_Location"].astype("category")
+    df["Year_Month"] = df["Year_Month"].astype("category")
+
+    year, month = _decode_year_month(df["Year_Month"])
+    branch_codes, branch_cat = _encode(df["Branch"])
+    loc_codes, loc_cat = _encode(df["Reviewer_Location"])
+    return ReviewColumns(
+        frame=df,
+        branch_codes=branch_codes,
+        rating=df["Rating"].to_numpy(),
+        loc_codes=loc_codes,
+        year=year,
+        month=month,
+        branch_cat=branch_cat,
+        loc_cat=loc_cat,
+    )
 
-def filter_reviews_by_park(rows: list[dict], park: str) -> list[dict]:
-    target = _norm(park)
-    return [r for r in rows if _norm(r.get("Branch", "")) == target]
 
+def filter_reviews_by_park(cols: ReviewColumns, park: str) -> pd.DataFrame:
+    return cols.frame.iloc[cols.park_rows(park)]
 
-def count_reviews_by_park_and_location(rows: list[dict], park: str, location: str) -> int:
-    park_n = _norm(park)
-    loc_n = _norm(location)
-    return sum(
-        1
-        for r in rows
-        if _norm(r.get("Branch", "")) == park_n and _norm(r.get("Reviewer_Location", "")) == loc_n
-    )
 
+def count_reviews_by_park_and_location(cols: ReviewColumns, park: str, location: str) -> int:
+    parks = _matching_codes(cols._branch_keys, park)
+    locs = _matching_codes(cols._loc_keys, location)
+    return int(cols._pair_stats[1][np.ix_(parks, locs)].sum())
 
-def average_rating_for_park_in_year(rows: list[dict], park: str, year: str) -> float | None:
-    park_n = _norm(park)
-    total = 0
-    count = 0
-    for r in rows:
-        if _norm(r.get("Branch", "")) != park_n:
-            continue
-        ym = (r.get("Year_Month") or "").strip()
-        if ym.startswith(year):
-            total += int(r.get("Rating", 0) or 0)
-            count += 1
-    return (total / count) if count else None
-
-
-def review_counts_by_park(rows: list[dict]) -> list[tuple[str, int]]:
-    counts: dict[str, int] = defaultdict(int)
-    for r in rows:
-        park = (r.get("Branch") or "").strip()
-        if park:
-            counts[park] += 1
-    return sorted(counts.items(), key=lambda x: x[1], reverse=True)
-
-
-def _group_sum_count(
-    rows: list[dict],
-    key_fn: Callable[[dict], str],
-    filter_fn: Callable[[dict], bool] | None = None,
-) -> dict[str, tuple[int, int]]:
-    sums: dict[str, int] = defaultdict(int)
-    counts: dict[str, int] = defaultdict(int)
-
-    for r in rows:
-        if filter_fn is not None and not filter_fn(r):
-            continue
-        key = key_fn(r)
-        if not key:
-            continue
-        rating = int(r.get("Rating", 0) or 0)
-        sums[key] += rating
-        counts[key] += 1
-
-    return {k: (sums[k], counts[k]) for k in counts.keys()}
-
-
-def top_locations_by_average_rating(rows: list[dict], park: str, top_n: int = 10) -> list[tuple[str, float]]:
-    park_n = _norm(park)
-    grouped = _group_sum_count(
-        rows,
-        key_fn=lambda r: (r.get("Reviewer_Location") or "").strip(),
-        filter_fn=lambda r: _norm(r.get("Branch", "")) == park_n,
-    )
 
-    avgs: list[tuple[str, float]] = []
-    for location, (total, count) in grouped.items():
-        if count:
-            avgs.append((location, total / count))
+def average_rating_for_park_in_year(cols: ReviewColumns, park: str, year: str) -> float | None:
+    """year is a 4-digit string, as returned by tui.ask_year."""
+    year = year.strip()
+    if not year.isdigit():
+        return None
+    positions = cols.park_rows(park)
+    ratings = cols.rating[positions][cols.year[positions] == int(year)]
+    return float(ratings.mean()) if len(ratings) else None
+
 
-    avgs.sort(key=lambda x: (-x[1], x[0]))
-    return avgs[:top_n]
+def review_counts_by_park(cols: ReviewColumns) -> list[tuple[str, int]]:
+    valid = cols.branch_codes >= 0
+    counts = np.bincount(cols.branch_codes[valid], minlength=len(cols.branch_cat.categories))
+    # Ties keep the order in which parks first appear in the file.
+    first_seen = [rows[0] if len(rows) else len(cols) for rows in cols._rows_by_branch]
+    order = np.lexsort((first_seen, -counts))
+    return [(str(cols.branch_cat.categories[i]), int(counts[i])) for i in order if counts[i]]
+
+
+def _ranked_locations(cols: ReviewColumns, totals: np.ndarray, counts: np.ndarray) -> list[tuple[str, float]]:
+    """(location, average) pairs by descending average, ties by name."""
+    seen = np.flatnonzero(counts)
+    avgs = totals[seen] / counts[seen]
+    # Categories are sorted, so ordering by code breaks ties by name.
+    order = np.lexsort((seen, -avgs))
+    names = cols.loc_cat.categories[seen[order]]
+    return [(str(name), float(avg)) for name, avg in zip(names, avgs[order])]
+
+
+def top_locations_by_average_rating(cols: ReviewColumns, park: str, top_n: int = 10) -> list[tuple[str, float]]:
+    positions = cols.park_rows(park)
+    locs = cols.loc_codes[positions]
+    valid = locs >= 0
+    n_loc = len(cols.loc_cat.categories)
+    totals = np.bincount(locs[valid], weights=cols.rating[positions][valid], minlength=n_loc)
+    counts = np.bincount(locs[valid], minlength=n_loc)
+    return _ranked_locations(cols, totals, counts)[:top_n]
 
 
 _MONTHS = (
@@ -108,56 +279,29 @@ _MONTHS = (
 )
 
 
-def average_monthly_rating_ignoring_year(rows: list[dict], park: str) -> dict[str, float]:
-    park_n = _norm(park)
-    totals = [0] * 12
-    counts = [0] * 12
+def _monthly_totals(rating: np.ndarray, month_idx: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Single pass over one park's rows: rating totals and counts per month."""
+    valid = month_idx >= 0
+    months = month_idx[valid]
+    totals = np.bincount(months, weights=rating[valid], minlength=12)
+    counts = np.bincount(months, minlength=12)
+    return totals, counts
 
-    for r in rows:
-        if _norm(r.get("Branch", "")) != park_n:
-            continue
-        ym = (r.get("Year_Month") or "").strip()
-        parts = ym.split("-")
-        if len(parts) != 2:
-            continue
-        try:
-            month_idx = int(parts[1]) - 1
-        except ValueError:
-            continue
-        if not (0 <= month_idx <= 11):
-            continue
 
-        totals[month_idx] += int(r.get("Rating", 0) or 0)
-        counts[month_idx] += 1
+def average_monthly_rating_ignoring_year(cols: ReviewColumns, park: str) -> dict[str, float]:
+    positions = cols.park_rows(park)
+    totals, counts = _monthly_totals(cols.rating[positions], cols.month[positions])
 
     out: dict[str, float] = {}
     for idx, name in enumerate(_MONTHS):
         if counts[idx] > 0:
-            out[name] = totals[idx] / counts[idx]
+            out[name] = float(totals[idx] / counts[idx])
     return out
 
 
-def average_rating_by_location_for_each_park(rows: list[dict]) -> dict[str, list[tuple[str, float]]]:
-    sums: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
-    counts: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
-
-    for r in rows:
-        park = (r.get("Branch") or "").strip()
-        loc = (r.get("Reviewer_Location") or "").strip()
-        if not park or not loc:
-            continue
-        rating = int(r.get("Rating", 0) or 0)
-        sums[park][loc] += rating
-        counts[park][loc] += 1
-
-    report: dict[str, list[tuple[str, float]]] = {}
-    for park in sums.keys():
-        rows_out: list[tuple[str, float]] = []
-        for loc in sums[park].keys():
-            c = counts[park][loc]
-            if c:
-                rows_out.append((loc, sums[park][loc] / c))
-        rows_out.sort(key=lambda x: (-x[1], x[0]))
-        report[park] = rows_out
-
-    return report
+def average_rating_by_location_for_each_park(cols: ReviewColumns) -> dict[str, list[tuple[str, float]]]:
+    totals, counts = cols._pair_stats
+    return {
+        str(cols.branch_cat.categories[code]): _ranked_locations(cols, totals[code], counts[code])
+        for code in np.flatnonzero(counts.any(axis=1))
+    }
@@ -8,6 +8,15 @@ No dataset logic should live here.
 
 from __future__ import annotations
 
+import io
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def show_title(title: str) -> None:
     line = "-" * len(title)
@@ -41,29 +50,52 @@ def _prompt_choice(prompt: str) -> str:
     return input(prompt).strip().upper()
 
 
+_MENU_LABELS = {
+    "main": {"A": "View Data", "B": "Visualise Data", "C": "Export Data", "X": "Exit"},
+    "view": {
+        "A": "View Reviews by Park",
+        "B": "Number of Reviews by Park and Reviewer Location",
+        "C": "Average Score per year by Park",
+        "D": "Average Score per Park by Reviewer Location",
+    },
+    "visual": {
+        "A": "Most Reviewed Parks",
+        "B": "Park Ranking by Nationality",
+        "C": "Most Popular Month by Park",
+    },
+    "export": {"T": "Export to Text (.txt)", "C": "Export to CSV (.csv)", "J": "Export to JSON (.json)"},
+}
+
+# Flattened once at import so each echo is a single lookup.
+_LABELS = {
+    (context, choice): label
+    for context, options in _MENU_LABELS.items()
+    for choice, label in options.items()
+}
+
+
 def echo_choice(choice: str, context: str) -> None:
     """Echo the user's choice back using a context label."""
-    labels = {
-        "main": {"A": "View Data", "B": "Visualise Data", "C": "Export Data", "X": "Exit"},
-        "view": {
-            "A": "View Reviews by Park",
-            "B": "Number of Reviews by Park and Reviewer Location",
-            "C": "Average Score per year by Park",
-            "D": "Average Score per Park by Reviewer Location",
-        },
-        "visual": {
-            "A": "Most Reviewed Parks",
-            "B": "Park Ranking by Nationality",
-            "C": "Most Popular Month by Park",
-        },
-        "export": {"T": "Export to Text (.txt)", "C": "Export to CSV (.csv)", "J": "Export to JSON (.json)"},
-    }
-
-    label = labels.get(context, {}).get(choice)
+    label = _LABELS.get((context, choice))
     if label:
         print(f"You have chosen option {choice} - {label}\n")
 
 
+@contextmanager
+def scripted_input(lines: list[str]) -> Iterator[None]:
+    """Feed the given lines to every prompt instead of the keyboard.
+
+    Lets a whole menu session be replayed without a terminal, e.g.
+    ``with scripted_input(["A", "A", "Disneyland_Paris", "X"]): ...``.
+    """
+    original = sys.stdin
+    sys.stdin = io.StringIO("".join(f"{line}\n" for line in lines))
+    try:
+        yield
+    finally:
+        sys.stdin = original
+
+
 def menu_main() -> str:
     print("Please enter the letter which corresponds with your desired menu choice:")
     print("[A] View Data")
@@ -126,13 +158,13 @@ def ask_filename() -> str:
     return _ask_nonempty("Enter desired filename (e.g., 'report'): ")
 
 
-def show_reviews(reviews: list[dict], park_name: str) -> None:
-    if not reviews:
+def show_reviews(reviews: pd.DataFrame, park_name: str) -> None:
+    if reviews.empty:
         print(f"No reviews found for '{park_name}'. Please check the park name.\n")
         return
 
     print(f"\n--- Reviews for {park_name} ({len(reviews)} reviews) ---")
-    for idx, review in enumerate(reviews, start=1):
+    for idx, review in enumerate(reviews.to_dict("records"), start=1):
         print(f"Review {idx}:")
         print(f"  Rating: {review.get('Rating', 'N/A')}/5")
         print(f"  Date: {review.get('Year_Month', 'N/A')}")
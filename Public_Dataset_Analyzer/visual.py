@@ -5,42 +5,35 @@ Matplotlib visualisations for the Disneyland Review Analyser.
 
 from __future__ import annotations
 
-import matplotlib.pyplot as plt
+from functools import lru_cache
 
+import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 
-def pie_review_counts(labels: list[str], counts: list[int]) -> None:
-    if not labels or not counts or sum(counts) == 0:
-        print("No data to plot.")
-        return
 
-    fig, ax = plt.subplots(figsize=(6, 6))
+def _draw_pie(ax: Axes, labels: list[str], counts: list[int]) -> None:
     ax.pie(counts, labels=labels, autopct="%1.1f%%", startangle=90)
     ax.set_title("Number of Reviews per Park")
     ax.axis("equal")
-    plt.tight_layout()
-    plt.show()
 
 
-def _bar_chart(
+def _draw_bar(
+    ax: Axes,
     x_labels: list[str],
     y_values: list[float],
     title: str,
     x_axis: str,
     y_axis: str,
-    value_format: str = "{:.2f}",
+    value_format: str,
 ) -> None:
-    if not x_labels or not y_values or len(x_labels) != len(y_values):
-        print("Invalid data for bar chart.")
-        return
-
-    fig, ax = plt.subplots(figsize=(9, 5))
     bars = ax.bar(x_labels, y_values)
 
     ax.set_title(title)
     ax.set_xlabel(x_axis)
     ax.set_ylabel(y_axis)
 
-    plt.xticks(rotation=45, ha="right")
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
     ax.grid(axis="y", linestyle="--", alpha=0.5)
 
     for bar in bars:
@@ -55,25 +48,81 @@ def _bar_chart(
             fontsize=8,
         )
 
-    plt.tight_layout()
+
+# Export figures are bare Figures, not managed by pyplot, so exporting never
+# starts a GUI backend. They are a pure function of the chart data, so
+# re-exporting the same chart reuses the already built artists.
+@lru_cache(maxsize=8)
+def _pie_export(labels: tuple[str, ...], counts: tuple[int, ...]) -> Figure:
+    fig = Figure(figsize=(6, 6))
+    _draw_pie(fig.subplots(), list(labels), list(counts))
+    fig.tight_layout()
+    return fig
+
+
+@lru_cache(maxsize=8)
+def _bar_export(x_labels: tuple[str, ...], y_values: tuple[float, ...], *text: str) -> Figure:
+    fig = Figure(figsize=(9, 5))
+    _draw_bar(fig.subplots(), list(x_labels), list(y_values), *text)
+    fig.tight_layout()
+    return fig
+
+
+def pie_review_counts(labels: list[str], counts: list[int], save_path: str | None = None) -> None:
+    if not labels or not counts or sum(counts) == 0:
+        print("No data to plot.")
+        return
+
+    if save_path:
+        _pie_export(tuple(labels), tuple(counts)).savefig(save_path, dpi=100)
+        return
+
+    fig, ax = plt.subplots(figsize=(6, 6))
+    _draw_pie(ax, labels, counts)
+    fig.tight_layout()
+    plt.show()
+
+
+def _bar_chart(
+    x_labels: list[str],
+    y_values: list[float],
+    title: str,
+    x_axis: str,
+    y_axis: str,
+    value_format: str = "{:.2f}",
+    save_path: str | None = None,
+) -> None:
+    if not x_labels or not y_values or len(x_labels) != len(y_values):
+        print("Invalid data for bar chart.")
+        return
+
+    if save_path:
+        _bar_export(tuple(x_labels), tuple(y_values), title, x_axis, y_axis, value_format).savefig(save_path, dpi=100)
+        return
+
+    fig, ax = plt.subplots(figsize=(9, 5))
+    _draw_bar(ax, x_labels, y_values, title, x_axis, y_axis, value_format)
+    fig.tight_layout()
     plt.show()
 
 
-def bar_top_locations(park: str, locations: list[str], avgs: list[float]) -> None:
+def bar_top_locations(park: str, locations: list[str], avgs: list[float], save_path: str | None = None) -> None:
     _bar_chart(
         locations,
         avgs,
         title=f"Top 10 Locations by Avg Rating for {park}",
         x_axis="Reviewer Location",
         y_axis="Average Rating (out of 5)",
+        save_path=save_path,
     )
 
 
-def bar_monthly_average(park: str, months: list[str], avgs: list[float]) -> None:
+def bar_monthly_average(park: str, months: list[str], avgs: list[float], save_path: str | None = None) -> None:
     _bar_chart(
         months,
         avgs,
         title=f"Average Rating per Month for {park}",
         x_axis="Month",
         y_axis="Average Rating (out of 5)",
+        save_path=save_path,
     )